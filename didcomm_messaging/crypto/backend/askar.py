@@ -1,13 +1,18 @@
 """Askar backend for DIDComm Messaging."""
 
-from collections import OrderedDict
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 import hashlib
 import json
-from typing import Optional, Sequence, Union
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from pydid import VerificationMethod
 
 from didcomm_messaging.crypto.base import (
+    _base58btc,
     CryptoService,
     CryptoServiceError,
     PublicKey,
@@ -23,6 +28,84 @@ except ImportError:
     raise ImportError("Askar backend requires the 'askar' extra to be installed")
 
 
+_Recipients = Tuple[Tuple[str, Key], ...]
+_WrapKey = Callable[[str, Key], JweRecipient]
+
+# Key wraps are only split across threads on multi-core hosts, for envelopes with at
+# least this many recipients; below it the thread handoffs cost more than the wraps
+_WRAP_FANOUT_MIN_RECIPIENTS = 8
+_CPU_COUNT = os.cpu_count() or 1
+
+_wrap_executor: Optional[ThreadPoolExecutor] = None
+_wrap_executor_lock = threading.Lock()
+
+
+def _get_wrap_executor() -> ThreadPoolExecutor:
+    """Get the executor shared by all services for wrapping keys, creating it once."""
+    global _wrap_executor
+    with _wrap_executor_lock:
+        if _wrap_executor is None:
+            _wrap_executor = ThreadPoolExecutor(
+                max_workers=_CPU_COUNT, thread_name_prefix="askar-wrap"
+            )
+        return _wrap_executor
+
+
+def _should_fan_out(recipient_count: int) -> bool:
+    """Check whether wrapping keys in parallel is worth the thread handoffs."""
+    return _CPU_COUNT > 1 and recipient_count >= _WRAP_FANOUT_MIN_RECIPIENTS
+
+
+def _wrap_all(wrap: _WrapKey, recips: _Recipients) -> List[JweRecipient]:
+    """Wrap the content encryption key for each recipient in turn."""
+    return [wrap(kid, recip_key) for kid, recip_key in recips]
+
+
+_ECDH_ES_WRAP_ALGS = {
+    "ECDH-ES+A128KW": "A128KW",
+    "ECDH-ES+A256KW": "A256KW",
+}
+_ECDH_1PU_WRAP_ALGS = {
+    "ECDH-1PU+A128KW": "A128KW",
+    "ECDH-1PU+A256KW": "A256KW",
+}
+
+_OKP_ALG_TO_CRV: Dict[KeyAlg, str] = {
+    KeyAlg.ED25519: "Ed25519",
+    KeyAlg.X25519: "X25519",
+}
+
+
+class _VerificationMethodRef:
+    """Hashable reference to a Verification Method, compared by its key fields."""
+
+    __slots__ = ("vm", "kid", "_fields")
+
+    def __init__(self, vm: VerificationMethod, kid: str):
+        jwk = vm.public_key_jwk
+        self.vm = vm
+        self.kid = kid
+        self._fields = (
+            vm.type,
+            kid,
+            vm.public_key_multibase,
+            vm.public_key_base58,
+            json.dumps(jwk, sort_keys=True) if jwk else None,
+        )
+
+    def __hash__(self) -> int:
+        return hash(self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _VerificationMethodRef) and self._fields == other._fields
+
+
+@lru_cache(maxsize=None)
+def _codec_prefix(codec: str) -> bytes:
+    """Get the multicodec prefix for a codec name."""
+    return multicodec.multicodec(codec).code
+
+
 class AskarKey(PublicKey):
     """Public key implementation for Askar."""
 
@@ -44,9 +127,11 @@ class AskarKey(PublicKey):
 
     def __init__(self, key: Key, kid: str):
         """Initialize a new AskarKey instance."""
+        if key.algorithm not in self.alg_to_codec:
+            raise ValueError("Unsupported key type")
         self.key = key
         self._kid = kid
-        self._multikey = self.key_to_multikey(key)
+        self._multikey: Optional[str] = None
 
     @classmethod
     def key_to_multikey(cls, key: Key) -> str:
@@ -56,18 +141,30 @@ class AskarKey(PublicKey):
             raise ValueError("Unsupported key type")
 
         return multibase.encode(
-            multicodec.wrap(multicodec.multicodec(codec), key.get_public_bytes()),
-            "base58btc",
+            _codec_prefix(codec) + key.get_public_bytes(), multibase.Encoding.base58btc
         )
 
+    @classmethod
+    def key_to_jwk(cls, key: Key) -> dict:
+        """Get the public JWK of an Askar Key instance as a dict."""
+        crv = _OKP_ALG_TO_CRV.get(key.algorithm)
+        if not crv:
+            # EC keys need the uncompressed point; let Askar produce the JWK
+            return json.loads(key.get_jwk_public())
+
+        return {"crv": crv, "kty": "OKP", "x": b64url(key.get_public_bytes())}
+
     @classmethod
     def multikey_to_key(cls, multikey: str) -> Key:
         """Convert a multibase-encoded key to an Askar Key instance."""
-        decoded = multibase.decode(multikey)
+        if multikey.startswith(_base58btc.character):
+            decoded = _base58btc.decode(multikey[1:])
+        else:
+            decoded = multibase.decode(multikey)
         codec, key = multicodec.unwrap(decoded)
         alg = cls.codec_to_alg.get(codec.name)
         if not alg:
-            raise ValueError("Unsupported key type: {codec.name}")
+            raise ValueError(f"Unsupported key type: {codec.name}")
         try:
             return Key.from_public_bytes(alg, key)
         except AskarError as err:
@@ -75,12 +172,33 @@ class AskarKey(PublicKey):
 
     @classmethod
     def from_verification_method(cls, vm: VerificationMethod) -> "AskarKey":
-        """Create a Key instance from a DID Document Verification Method."""
+        """Create a Key instance from a DID Document Verification Method.
+
+        Results are cached by the verification method's key fields. Call
+        `clear_verification_method_cache` after changing the `type_to_alg` or
+        `type_to_codec` registrations.
+        """
         if not vm.id.did:
             kid = vm.id.as_absolute(vm.controller)
         else:
             kid = vm.id
 
+        return cls._from_verification_method_ref(_VerificationMethodRef(vm, kid))
+
+    @classmethod
+    def clear_verification_method_cache(cls):
+        """Forget all keys cached by `from_verification_method`."""
+        cls._from_verification_method_ref.cache_clear()
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _from_verification_method_ref(cls, ref: "_VerificationMethodRef") -> "AskarKey":
+        """Create a Key instance from a Verification Method, caching the result.
+
+        Keys hold only public material, so cached instances are shared.
+        """
+        vm = ref.vm
+        kid = ref.kid
         if vm.type == "Multikey":
             multikey = vm.public_key_multibase
             if not multikey:
@@ -101,7 +219,7 @@ class AskarKey(PublicKey):
 
         alg = cls.type_to_alg.get(vm.type)
         if not alg:
-            raise ValueError("Unsupported verification method type: {vm_type}")
+            raise ValueError(f"Unsupported verification method type: {vm.type}")
 
         key_bytes = cls.key_bytes_from_verification_method(vm)
         key = Key.from_public_bytes(alg, key_bytes)
@@ -115,6 +233,8 @@ class AskarKey(PublicKey):
     @property
     def multikey(self) -> str:
         """Get the key in multibase format."""
+        if self._multikey is None:
+            self._multikey = self.key_to_multikey(self.key)
         return self._multikey
 
 
@@ -139,10 +259,115 @@ class AskarSecretKey(SecretKey):
 class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
     """CryptoService backend implemented using Askar."""
 
+    def __init__(self):
+        """Initialize a new AskarCryptoService instance."""
+        self._local = threading.local()
+
+    def _get_builder(self) -> JweBuilder:
+        """Get a freshly reset JWE builder owned by the current thread.
+
+        Callers reset the builder again once the envelope is serialized, so an idle
+        thread does not keep the last message alive.
+        """
+        builder = getattr(self._local, "builder", None)
+        if builder is None:
+            builder = self._local.builder = JweBuilder(with_flatten_recipients=False)
+        else:
+            builder.reset(with_flatten_recipients=False)
+        return builder
+
+    def _ecdh_es_wrap_key(
+        self,
+        kdf: ecdh.EcdhEs,
+        wrap_alg: KeyAlg,
+        cek: Key,
+        kid: str,
+        recip_key: Key,
+    ) -> JweRecipient:
+        """Wrap the content encryption key for a single ECDH-ES recipient."""
+        try:
+            epk = Key.generate(recip_key.algorithm, ephemeral=True)
+        except AskarError:
+            raise CryptoServiceError("Error creating ephemeral key")
+        enc_key = kdf.sender_wrap_key(wrap_alg, epk, recip_key, cek)
+        return JweRecipient(
+            encrypted_key=enc_key.ciphertext,
+            header={
+                "kid": kid,
+                "epk": AskarKey.key_to_jwk(epk),
+            },
+        )
+
+    def _ecdh_1pu_wrap_key(
+        self,
+        kdf: ecdh.Ecdh1PU,
+        wrap_alg: KeyAlg,
+        epk: Key,
+        sender_key: Key,
+        cek: Key,
+        cc_tag: bytes,
+        kid: str,
+        recip_key: Key,
+    ) -> JweRecipient:
+        """Wrap the content encryption key for a single ECDH-1PU recipient."""
+        enc_key = kdf.sender_wrap_key(
+            wrap_alg, epk, sender_key, recip_key, cek, cc_tag=cc_tag
+        )
+        return JweRecipient(encrypted_key=enc_key.ciphertext, header={"kid": kid})
+
+    async def _encrypt_fanned_out(
+        self, prepare: Callable[[JweBuilder], Tuple[_Recipients, _WrapKey]]
+    ) -> bytes:
+        """Encrypt an envelope, wrapping the recipient keys in parallel chunks.
+
+        The payload is encrypted first, then one chunk of recipients per CPU is wrapped
+        on the shared wrap executor. Chunks are submitted from the event loop, so no
+        worker ever blocks waiting on another.
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_wrap_executor()
+        builder = JweBuilder(with_flatten_recipients=False)
+        recips, wrap = await loop.run_in_executor(executor, prepare, builder)
+        size = -(-len(recips) // _CPU_COUNT)
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _wrap_all, wrap, recips[i : i + size])
+                for i in range(0, len(recips), size)
+            )
+        )
+        recipients = [recip for chunk in chunks for recip in chunk]
+        return await loop.run_in_executor(
+            executor, self._build_envelope, builder, recipients
+        )
+
+    def _build_envelope(
+        self, builder: JweBuilder, recipients: Sequence[JweRecipient]
+    ) -> bytes:
+        """Add the wrapped keys to a prepared builder and serialize the envelope."""
+        for recip in recipients:
+            builder.add_recipient(recip)
+        return builder.build().to_bytes()
+
     async def ecdh_es_encrypt(self, to_keys: Sequence[AskarKey], message: bytes) -> bytes:
         """Encode a message into DIDComm v2 anonymous encryption."""
-        builder = JweBuilder(with_flatten_recipients=False)
+        if _should_fan_out(len(to_keys)):
+            return await self._encrypt_fanned_out(
+                partial(self._ecdh_es_prepare, to_keys=to_keys, message=message)
+            )
+        return await asyncio.to_thread(self._ecdh_es_encrypt_sync, to_keys, message)
 
+    def _ecdh_es_encrypt_sync(self, to_keys: Sequence[AskarKey], message: bytes) -> bytes:
+        builder = self._get_builder()
+        try:
+            recips, wrap = self._ecdh_es_prepare(builder, to_keys, message)
+            return self._build_envelope(builder, _wrap_all(wrap, recips))
+        finally:
+            builder.reset()
+
+    def _ecdh_es_prepare(
+        self, builder: JweBuilder, to_keys: Sequence[AskarKey], message: bytes
+    ) -> Tuple[_Recipients, _WrapKey]:
+        """Encrypt the payload into the builder and return the per-recipient wrap."""
         alg_id = "ECDH-ES+A256KW"
         enc_id = "XC20P"
         enc_alg = KeyAlg.XC20P
@@ -156,39 +381,19 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
         except AskarError:
             raise CryptoServiceError("Error creating content encryption key")
 
-        apv = []
-        for recip_key in to_keys:
-            apv.append(recip_key.kid)
-        apv.sort()
-        apv = hashlib.sha256((".".join(apv)).encode()).digest()
-
-        for recip_key in to_keys:
-            try:
-                epk = Key.generate(recip_key.key.algorithm, ephemeral=True)
-            except AskarError:
-                raise CryptoServiceError("Error creating ephemeral key")
-            enc_key = ecdh.EcdhEs(alg_id, None, apv).sender_wrap_key(  # type: ignore
-                wrap_alg, epk, recip_key.key, cek
-            )
-            builder.add_recipient(
-                JweRecipient(
-                    encrypted_key=enc_key.ciphertext,
-                    header={
-                        "kid": recip_key.kid,
-                        "epk": json.loads(epk.get_jwk_public()),
-                    },
-                )
-            )
+        recips = tuple((recip_key.kid, recip_key.key) for recip_key in to_keys)
+        # UTF-8 byte order matches code point order, so sorting the bytes is equivalent
+        apv = hashlib.sha256(
+            b".".join(sorted(kid.encode() for kid, _ in recips))
+        ).digest()
 
         builder.set_protected(
-            OrderedDict(
-                [
-                    ("typ", "application/didcomm-encrypted+json"),
-                    ("alg", alg_id),
-                    ("enc", enc_id),
-                    ("apv", b64url(apv)),
-                ]
-            )
+            {
+                "typ": "application/didcomm-encrypted+json",
+                "alg": alg_id,
+                "enc": enc_id,
+                "apv": b64url(apv),
+            }
         )
         try:
             payload = cek.aead_encrypt(message, aad=builder.protected_bytes)
@@ -196,7 +401,8 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
             raise CryptoServiceError("Error encrypting message payload")
         builder.set_payload(payload.ciphertext, payload.nonce, payload.tag)
 
-        return builder.build().to_json().encode("utf-8")
+        kdf = ecdh.EcdhEs(alg_id, None, apv)  # type: ignore
+        return recips, partial(self._ecdh_es_wrap_key, kdf, wrap_alg, cek)
 
     async def ecdh_es_decrypt(
         self,
@@ -204,15 +410,18 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
         recip_key: AskarSecretKey,
     ) -> bytes:
         """Decode a message from DIDComm v2 anonymous encryption."""
-        if isinstance(enc_message, bytes):
-            wrapper = enc_message.decode("utf-8")
+        return await asyncio.to_thread(self._ecdh_es_decrypt_sync, enc_message, recip_key)
+
+    def _ecdh_es_decrypt_sync(
+        self,
+        enc_message: Union[str, bytes],
+        recip_key: AskarSecretKey,
+    ) -> bytes:
         wrapper = JweEnvelope.from_json(enc_message)
 
         alg_id = wrapper.protected.get("alg")
-
-        if alg_id and alg_id in ("ECDH-ES+A128KW", "ECDH-ES+A256KW"):
-            wrap_alg = alg_id[8:]
-        else:
+        wrap_alg = _ECDH_ES_WRAP_ALGS.get(alg_id) if isinstance(alg_id, str) else None
+        if not wrap_alg:
             raise CryptoServiceError(
                 f"Missing or unsupported ECDH-ES algorithm: {alg_id}"
             )
@@ -270,8 +479,40 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
         message: bytes,
     ) -> bytes:
         """Encode a message into DIDComm v2 authenticated encryption."""
-        builder = JweBuilder(with_flatten_recipients=False)
+        if _should_fan_out(len(to_keys)):
+            return await self._encrypt_fanned_out(
+                partial(
+                    self._ecdh_1pu_prepare,
+                    to_keys=to_keys,
+                    sender_key=sender_key,
+                    message=message,
+                )
+            )
+        return await asyncio.to_thread(
+            self._ecdh_1pu_encrypt_sync, to_keys, sender_key, message
+        )
+
+    def _ecdh_1pu_encrypt_sync(
+        self,
+        to_keys: Sequence[AskarKey],
+        sender_key: AskarSecretKey,
+        message: bytes,
+    ) -> bytes:
+        builder = self._get_builder()
+        try:
+            recips, wrap = self._ecdh_1pu_prepare(builder, to_keys, sender_key, message)
+            return self._build_envelope(builder, _wrap_all(wrap, recips))
+        finally:
+            builder.reset()
 
+    def _ecdh_1pu_prepare(
+        self,
+        builder: JweBuilder,
+        to_keys: Sequence[AskarKey],
+        sender_key: AskarSecretKey,
+        message: bytes,
+    ) -> Tuple[_Recipients, _WrapKey]:
+        """Encrypt the payload into the builder and return the per-recipient wrap."""
         alg_id = "ECDH-1PU+A256KW"
         enc_id = "A256CBC-HS512"
         enc_alg = KeyAlg.A256CBC_HS512
@@ -291,30 +532,25 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
         except AskarError:
             raise CryptoServiceError("Error creating ephemeral key")
 
-        apu = sender_key.kid
-        apv = []
-        for recip_key in to_keys:
-            if agree_alg:
-                if agree_alg != recip_key.key.algorithm:
-                    raise CryptoServiceError("Recipient key types must be consistent")
-            else:
-                agree_alg = recip_key.key.algorithm
-            apv.append(recip_key.kid)
-        apv.sort()
-        apv = hashlib.sha256((".".join(apv)).encode()).digest()
+        apu = sender_key.kid.encode()
+        recips = tuple((recip_key.kid, recip_key.key) for recip_key in to_keys)
+        if any(recip_key.algorithm != agree_alg for _, recip_key in recips):
+            raise CryptoServiceError("Recipient key types must be consistent")
+        # UTF-8 byte order matches code point order, so sorting the bytes is equivalent
+        apv = hashlib.sha256(
+            b".".join(sorted(kid.encode() for kid, _ in recips))
+        ).digest()
 
         builder.set_protected(
-            OrderedDict(
-                [
-                    ("typ", "application/didcomm+encrypted"),
-                    ("alg", alg_id),
-                    ("enc", enc_id),
-                    ("apu", b64url(apu)),
-                    ("apv", b64url(apv)),
-                    ("epk", json.loads(epk.get_jwk_public())),
-                    ("skid", sender_key.kid),
-                ]
-            )
+            {
+                "typ": "application/didcomm+encrypted",
+                "alg": alg_id,
+                "enc": enc_id,
+                "apu": b64url(apu),
+                "apv": b64url(apv),
+                "epk": AskarKey.key_to_jwk(epk),
+                "skid": sender_key.kid,
+            }
         )
         try:
             payload = cek.aead_encrypt(message, aad=builder.protected_bytes)
@@ -322,33 +558,33 @@ class AskarCryptoService(CryptoService[AskarKey, AskarSecretKey]):
             raise CryptoServiceError("Error encrypting message payload")
         builder.set_payload(payload.ciphertext, payload.nonce, payload.tag)
 
-        for recip_key in to_keys:
-            enc_key = ecdh.Ecdh1PU(alg_id, apu, apv).sender_wrap_key(
-                wrap_alg, epk, sender_key.key, recip_key.key, cek, cc_tag=payload.tag
-            )
-            builder.add_recipient(
-                JweRecipient(
-                    encrypted_key=enc_key.ciphertext, header={"kid": recip_key.kid}
-                )
-            )
-
-        return builder.build().to_json().encode("utf-8")
+        kdf = ecdh.Ecdh1PU(alg_id, apu, apv)
+        return recips, partial(
+            self._ecdh_1pu_wrap_key, kdf, wrap_alg, epk, sender_key.key, cek, payload.tag
+        )
 
     async def ecdh_1pu_decrypt(
         self,
         enc_message: Union[str, bytes],
         recip_key: AskarSecretKey,
         sender_key: AskarKey,
-    ):
+    ) -> bytes:
         """Decode a message from DIDComm v2 authenticated encryption."""
-        if isinstance(enc_message, bytes):
-            wrapper = enc_message.decode("utf-8")
+        return await asyncio.to_thread(
+            self._ecdh_1pu_decrypt_sync, enc_message, recip_key, sender_key
+        )
+
+    def _ecdh_1pu_decrypt_sync(
+        self,
+        enc_message: Union[str, bytes],
+        recip_key: AskarSecretKey,
+        sender_key: AskarKey,
+    ) -> bytes:
         wrapper = JweEnvelope.from_json(enc_message)
 
         alg_id = wrapper.protected.get("alg")
-        if alg_id and alg_id in ("ECDH-1PU+A128KW", "ECDH-1PU+A256KW"):
-            wrap_alg = alg_id[9:]
-        else:
+        wrap_alg = _ECDH_1PU_WRAP_ALGS.get(alg_id) if isinstance(alg_id, str) else None
+        if not wrap_alg:
             raise CryptoServiceError(f"Unsupported ECDH-1PU algorithm: {alg_id}")
 
         enc_alg = wrapper.protected.get("enc")
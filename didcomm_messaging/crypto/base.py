@@ -7,6 +7,8 @@ from pydid import VerificationMethod
 
 from didcomm_messaging.multiformats import multibase, multicodec
 
+_base58btc = multibase.Encoding.base58btc.value
+
 
 class CryptoServiceError(Exception):
     """Represents an error from a CryptoService."""
@@ -55,7 +57,7 @@ class PublicKey(ABC):
                 return decoded
 
         if vm.public_key_base58:
-            return multibase.decode("z" + vm.public_key_base58)
+            return _base58btc.decode(vm.public_key_base58)
 
         raise ValueError("Invalid verification method")
 
@@ -8,6 +8,15 @@ from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
 
 from didcomm_messaging.multiformats.multibase import Base64UrlEncoder
 
+# Faster JSON encoding and decoding is available with the `orjson` extra
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 IDENT_ENC_KEY = "encrypted_key"
 IDENT_HEADER = "header"
 IDENT_PROTECTED = "protected"
@@ -74,10 +83,18 @@ class JweBuilder:
         with_flatten_recipients: bool = True,
     ):
         """Initialize the JWE builder."""
+        self.reset(with_protected_recipients, with_flatten_recipients)
+
+    def reset(
+        self,
+        with_protected_recipients: bool = False,
+        with_flatten_recipients: bool = True,
+    ):
+        """Reset the builder so it can be reused for a new JWE envelope."""
         self._with_protected_recipients = with_protected_recipients
         self._with_flatten_recipients = with_flatten_recipients
         self._recipients: List[JweRecipient] = []
-        self._protected: Optional[OrderedDict] = None
+        self._protected: Optional[dict] = None
         self._unprotected: Optional[OrderedDict] = None
         self._protected_b64: Optional[bytes] = None
         self._ciphertext: Optional[bytes] = None
@@ -105,17 +122,17 @@ class JweBuilder:
         protected: Mapping[str, Any],
     ):
         """Set the protected headers of the JWE envelope."""
-        protected = OrderedDict(protected.items())
+        headers = dict(protected)
         if self._with_protected_recipients:
             recipients = self.recipients_json
             if self._with_flatten_recipients and len(recipients) == 1:
-                protected.update(recipients[0])
+                headers.update(recipients[0])
             elif recipients:
-                protected[IDENT_RECIPIENTS] = recipients
+                headers[IDENT_RECIPIENTS] = recipients
             else:
                 raise ValueError("Missing message recipients")
-        self._protected = protected
-        self._protected_b64 = b64url(json.dumps(protected)).encode("utf-8")
+        self._protected = headers
+        self._protected_b64 = b64url(json.dumps(headers)).encode("utf-8")
 
     def set_unprotected(self, unprotected: OrderedDict):
         """Set the unprotected headers of the JWE envelope."""
@@ -183,10 +200,18 @@ class JweEnvelope:
     def from_json(cls, message: Union[bytes, str]) -> "JweEnvelope":
         """Decode a JWE envelope from a JSON string or bytes value."""
         try:
-            return cls._deserialize(json.loads(message))
+            return cls._deserialize(_json_loads(message))
         except json.JSONDecodeError:
             raise ValueError("Invalid JWE: not JSON")
 
+    @classmethod
+    def from_bytes(cls, message: bytes) -> "JweEnvelope":
+        """Decode a JWE envelope from a JSON bytes value.
+
+        Alias of `from_json`, which accepts both str and bytes.
+        """
+        return cls.from_json(message)
+
     @classmethod
     def deserialize(cls, message: Mapping[str, Any]) -> "JweEnvelope":  # noqa: C901
         """Deserialize a JWE envelope from a mapping."""
@@ -254,7 +279,7 @@ class JweEnvelope:
     def _deserialize(cls, parsed: Mapping[str, Any]) -> "JweEnvelope":  # noqa: C901
         protected_b64 = parsed[IDENT_PROTECTED]
         try:
-            protected: dict = json.loads(from_b64url(protected_b64))
+            protected: dict = _json_loads(from_b64url(protected_b64))
         except json.JSONDecodeError:
             raise ValueError("Invalid JWE: invalid JSON for protected headers") from None
         unprotected = parsed.get("unprotected") or {}
@@ -358,6 +383,12 @@ class JweEnvelope:
         """Serialize the JWE envelope to a JSON string."""
         return json.dumps(self.serialize())
 
+    def to_bytes(self) -> bytes:
+        """Serialize the JWE envelope to JSON bytes, using orjson if available."""
+        if orjson:
+            return orjson.dumps(self.serialize())
+        return self.to_json().encode("utf-8")
+
     def get_recipients(self) -> Iterable[JweRecipient]:
         """Accessor for an iterator over the JWE recipients.
 
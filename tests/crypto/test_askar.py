@@ -1,14 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+
 from aries_askar import Key, KeyAlg, Store
 from pydid import VerificationMethod
 import pytest
 
 from aries_askar.bindings import generate_raw_key
+from didcomm_messaging.crypto.base import CryptoServiceError
+from didcomm_messaging.crypto.backend import askar
 from didcomm_messaging.crypto.backend.askar import (
     AskarCryptoService,
     AskarKey,
     AskarSecretKey,
     AskarSecretsManager,
 )
+from didcomm_messaging.crypto.jwe import b64url, from_b64url
+from didcomm_messaging.multiformats import multibase
 
 
 ALICE_KID = "did:example:alice#key-1"
@@ -60,6 +68,133 @@ async def test_es_round_trip(crypto: AskarCryptoService):
     assert plaintext == MESSAGE
 
 
+@pytest.mark.asyncio
+async def test_decrypt_str_and_bytes(crypto: AskarCryptoService):
+    """Test that encrypted messages can be decrypted from str or bytes."""
+    alg = KeyAlg.X25519
+    alice_sk = Key.generate(alg)
+    bob_sk = Key.generate(alg)
+    bob_key = AskarKey(bob_sk, BOB_KID)
+    bob_priv_key = AskarSecretKey(bob_sk, BOB_KID)
+    alice_key = AskarKey(alice_sk, ALICE_KID)
+    alice_priv_key = AskarSecretKey(alice_sk, ALICE_KID)
+
+    es_message = await crypto.ecdh_es_encrypt([bob_key], MESSAGE)
+    pu_message = await crypto.ecdh_1pu_encrypt([bob_key], alice_priv_key, MESSAGE)
+
+    for enc_message in (es_message, es_message.decode()):
+        assert await crypto.ecdh_es_decrypt(enc_message, bob_priv_key) == MESSAGE
+    for enc_message in (pu_message, pu_message.decode()):
+        plaintext = await crypto.ecdh_1pu_decrypt(enc_message, bob_priv_key, alice_key)
+        assert plaintext == MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_decrypt_unsupported_alg(crypto: AskarCryptoService):
+    """Test that envelopes with an unsupported key wrapping algorithm are rejected."""
+    bob_sk = Key.generate(KeyAlg.X25519)
+    bob_key = AskarKey(bob_sk, BOB_KID)
+    bob_priv_key = AskarSecretKey(bob_sk, BOB_KID)
+
+    enc_message = json.loads(await crypto.ecdh_es_encrypt([bob_key], MESSAGE))
+    protected = json.loads(from_b64url(enc_message["protected"]))
+
+    for alg in ("ECDH-ES+A192KW", [], {}, None):
+        protected["alg"] = alg
+        enc_message["protected"] = b64url(json.dumps(protected))
+
+        with pytest.raises(CryptoServiceError, match="unsupported ECDH-ES algorithm"):
+            await crypto.ecdh_es_decrypt(json.dumps(enc_message), bob_priv_key)
+        with pytest.raises(CryptoServiceError, match="Unsupported ECDH-1PU algorithm"):
+            await crypto.ecdh_1pu_decrypt(json.dumps(enc_message), bob_priv_key, bob_key)
+
+
+@pytest.mark.asyncio
+async def test_multi_recipient_round_trip(crypto: AskarCryptoService):
+    """Test ECDH-ES and ECDH-1PU round trips with multiple recipients."""
+    alg = KeyAlg.X25519
+    alice_sk = Key.generate(alg)
+    alice_key = AskarKey(alice_sk, ALICE_KID)
+    alice_priv_key = AskarSecretKey(alice_sk, ALICE_KID)
+    recip_sks = {kid: Key.generate(alg) for kid in (BOB_KID, CAROL_KID)}
+    recip_keys = [AskarKey(sk, kid) for kid, sk in recip_sks.items()]
+
+    es_message = await crypto.ecdh_es_encrypt(recip_keys, MESSAGE)
+    pu_message = await crypto.ecdh_1pu_encrypt(recip_keys, alice_priv_key, MESSAGE)
+
+    for kid, sk in recip_sks.items():
+        priv_key = AskarSecretKey(sk, kid)
+        assert await crypto.ecdh_es_decrypt(es_message, priv_key) == MESSAGE
+        assert await crypto.ecdh_1pu_decrypt(pu_message, priv_key, alice_key) == MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_sequential_encrypts_independent(crypto: AskarCryptoService):
+    """Test that envelopes do not share state across encryptions."""
+    recip_keys = [
+        AskarKey(Key.generate(KeyAlg.X25519), kid) for kid in (BOB_KID, CAROL_KID)
+    ]
+
+    for count in (2, 1, 2, 1):
+        enc_message = json.loads(
+            await crypto.ecdh_es_encrypt(recip_keys[:count], MESSAGE)
+        )
+        assert len(enc_message["recipients"]) == count
+
+
+def test_encrypt_releases_builder(crypto: AskarCryptoService):
+    """Test that the reused builder does not hold on to the last envelope."""
+    recip_key = AskarKey(Key.generate(KeyAlg.X25519), BOB_KID)
+    sender_key = AskarSecretKey(Key.generate(KeyAlg.X25519), ALICE_KID)
+
+    crypto._ecdh_es_encrypt_sync([recip_key], MESSAGE)
+    builder = crypto._local.builder
+    assert builder._ciphertext is None
+    assert builder._protected is None
+    assert not builder._recipients
+
+    crypto._ecdh_1pu_encrypt_sync([recip_key], sender_key, MESSAGE)
+    assert crypto._local.builder is builder
+    assert builder._ciphertext is None
+    assert not builder._recipients
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fan_out", [False, True])
+async def test_concurrent_multi_recipient_encrypt(
+    crypto: AskarCryptoService, monkeypatch, fan_out: bool
+):
+    """Test that concurrent multi-recipient encryptions do not starve the executor."""
+    if fan_out:
+        monkeypatch.setattr(askar, "_CPU_COUNT", 2)
+        monkeypatch.setattr(askar, "_WRAP_FANOUT_MIN_RECIPIENTS", 2)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+    recip_sks = {kid: Key.generate(KeyAlg.X25519) for kid in (BOB_KID, CAROL_KID)}
+    recip_keys = [AskarKey(sk, kid) for kid, sk in recip_sks.items()]
+    sender_key = AskarSecretKey(Key.generate(KeyAlg.X25519), ALICE_KID)
+
+    messages = await asyncio.wait_for(
+        asyncio.gather(
+            *(crypto.ecdh_es_encrypt(recip_keys, MESSAGE) for _ in range(4)),
+            *(crypto.ecdh_1pu_encrypt(recip_keys, sender_key, MESSAGE) for _ in range(4)),
+        ),
+        timeout=10,
+    )
+    for message in messages:
+        assert len(json.loads(message)["recipients"]) == 2
+
+    for kid, sk in recip_sks.items():
+        priv_key = AskarSecretKey(sk, kid)
+        assert await crypto.ecdh_es_decrypt(messages[0], priv_key) == MESSAGE
+        assert (
+            await crypto.ecdh_1pu_decrypt(
+                messages[-1], priv_key, sender_key.as_public_key()
+            )
+            == MESSAGE
+        )
+
+
 @pytest.mark.asyncio
 async def test_askar_store():
     alg = KeyAlg.X25519
@@ -164,3 +299,109 @@ async def test_key_from_verification_method_unsupported():
     print(key.kid)
     assert type(key) is AskarKey
     # assert key.kid == expected
+
+
+@pytest.mark.parametrize("alg", [KeyAlg.X25519, KeyAlg.ED25519, KeyAlg.P256, KeyAlg.K256])
+def test_key_to_jwk(alg: KeyAlg):
+    key = Key.generate(alg)
+    assert AskarKey.key_to_jwk(key) == json.loads(key.get_jwk_public())
+
+
+@pytest.mark.parametrize("alg", [KeyAlg.X25519, KeyAlg.ED25519, KeyAlg.P256, KeyAlg.K256])
+def test_key_multikey_round_trip(alg: KeyAlg):
+    key = Key.generate(alg)
+    multikey = AskarKey(key, ALICE_KID).multikey
+    assert multikey.startswith("z")
+    assert AskarKey.multikey_to_key(multikey).get_public_bytes() == key.get_public_bytes()
+
+
+def test_key_from_verification_method_cached():
+    vm = {
+        "id": "#6LSqPZfn",
+        "type": "X25519KeyAgreementKey2020",
+        "publicKeyMultibase": "z6LSqPZfn9krvgXma2icTMKf2uVcYhKXsudCmPoUzqGYW24U",
+        "controller": "did:example:1",
+    }
+    first = AskarKey.from_verification_method(VerificationMethod.deserialize(vm))
+    second = AskarKey.from_verification_method(VerificationMethod.deserialize(vm))
+    assert first is second
+
+
+def test_key_from_verification_method_hook():
+    calls = []
+
+    class RecordingKey(AskarKey):
+        @classmethod
+        def key_bytes_from_verification_method(cls, vm: VerificationMethod) -> bytes:
+            calls.append(vm.id)
+            return super().key_bytes_from_verification_method(vm)
+
+    key = Key.generate(KeyAlg.X25519)
+    vm = VerificationMethod.deserialize(
+        {
+            "id": "#key-1",
+            "type": "X25519KeyAgreementKey2019",
+            "publicKeyBase58": multibase.encode(key.get_public_bytes(), "base58btc")[1:],
+            "controller": "did:example:8",
+        }
+    )
+    first = RecordingKey.from_verification_method(vm)
+    assert RecordingKey.from_verification_method(vm) is first
+    assert len(calls) == 1
+    assert first.key.get_public_bytes() == key.get_public_bytes()
+
+    RecordingKey.clear_verification_method_cache()
+    assert RecordingKey.from_verification_method(vm) is not first
+    assert len(calls) == 2
+
+
+def test_key_from_verification_method_jwk():
+    key = Key.generate(KeyAlg.X25519)
+    vm = VerificationMethod.deserialize(
+        {
+            "id": "#key-1",
+            "type": "JsonWebKey2020",
+            "publicKeyJwk": json.loads(key.get_jwk_public()),
+            "controller": "did:example:5",
+        }
+    )
+    askar_key = AskarKey.from_verification_method(vm)
+    assert askar_key.kid == "did:example:5#key-1"
+    assert askar_key.key.get_public_bytes() == key.get_public_bytes()
+
+
+def test_key_type_registration(monkeypatch):
+    monkeypatch.setitem(AskarKey.type_to_alg, "ExampleX25519Key", KeyAlg.X25519)
+    monkeypatch.setitem(AskarKey.type_to_codec, "ExampleX25519Key", "x25519-pub")
+    vm = VerificationMethod.deserialize(
+        {
+            "id": "#6LSqPZfn",
+            "type": "ExampleX25519Key",
+            "publicKeyMultibase": "z6LSqPZfn9krvgXma2icTMKf2uVcYhKXsudCmPoUzqGYW24U",
+            "controller": "did:example:6",
+        }
+    )
+    key = AskarKey.from_verification_method(vm)
+    assert key.key.algorithm == KeyAlg.X25519
+
+
+def test_key_subclass_tables():
+    class X25519OnlyKey(AskarKey):
+        codec_to_alg = {"x25519-pub": KeyAlg.X25519}
+        alg_to_codec = {KeyAlg.X25519: "x25519-pub"}
+        type_to_alg = {"X25519KeyAgreementKey2019": KeyAlg.X25519}
+
+    with pytest.raises(ValueError, match="Unsupported key type"):
+        X25519OnlyKey(Key.generate(KeyAlg.ED25519), ALICE_KID)
+
+    vm = VerificationMethod.deserialize(
+        {
+            "id": "#key-1",
+            "type": "Ed25519VerificationKey2018",
+            "publicKeyBase58": "8HH5gYEeNc3z7PYXmd54d4x6qAfCNrqQqEB3nS7Zfu7K",
+            "controller": "did:example:7",
+        }
+    )
+    assert AskarKey.from_verification_method(vm).key.algorithm == KeyAlg.ED25519
+    with pytest.raises(ValueError, match="Unsupported verification method type"):
+        X25519OnlyKey.from_verification_method(vm)
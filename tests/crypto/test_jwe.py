@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from didcomm_messaging.crypto import jwe
+from didcomm_messaging.crypto.jwe import JweBuilder, JweEnvelope, JweRecipient
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Run a test against both the orjson and the stdlib json code paths."""
+    if request.param == "orjson":
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(jwe, "orjson", orjson)
+        monkeypatch.setattr(jwe, "_json_loads", orjson.loads)
+    else:
+        monkeypatch.setattr(jwe, "orjson", None)
+        monkeypatch.setattr(jwe, "_json_loads", json.loads)
+    yield request.param
+
+
+@pytest.fixture
+def envelope():
+    builder = JweBuilder(with_flatten_recipients=False)
+    builder.add_recipient(
+        JweRecipient(encrypted_key=b"encrypted key", header={"kid": "did:example:bob#1"})
+    )
+    builder.set_protected({"alg": "ECDH-ES+A256KW", "enc": "XC20P"})
+    builder.set_payload(b"ciphertext", b"nonce", b"tag")
+    yield builder.build()
+
+
+def test_to_bytes_round_trip(json_backend, envelope: JweEnvelope):
+    encoded = envelope.to_bytes()
+    assert isinstance(encoded, bytes)
+
+    for message in (encoded, encoded.decode()):
+        decoded = JweEnvelope.from_json(message)
+        assert decoded.protected == envelope.protected
+        assert decoded.protected_b64 == envelope.protected_b64
+        assert decoded.ciphertext == envelope.ciphertext
+        assert decoded.iv == envelope.iv
+        assert decoded.tag == envelope.tag
+        assert list(decoded.recipient_key_ids) == ["did:example:bob#1"]
+
+
+def test_to_bytes_fallback_matches_to_json(monkeypatch, envelope: JweEnvelope):
+    monkeypatch.setattr(jwe, "orjson", None)
+    assert envelope.to_bytes() == envelope.to_json().encode()
+
+
+def test_to_bytes_is_json(json_backend, envelope: JweEnvelope):
+    assert json.loads(envelope.to_bytes()) == envelope.serialize()
+
+
+def test_from_bytes(json_backend, envelope: JweEnvelope):
+    decoded = JweEnvelope.from_bytes(envelope.to_bytes())
+    assert decoded.protected == envelope.protected
+    assert decoded.ciphertext == envelope.ciphertext
+
+
+@pytest.mark.parametrize("message", [b"{", b"[", "not json"])
+def test_from_json_invalid(json_backend, message):
+    with pytest.raises(ValueError, match="not JSON"):
+        JweEnvelope.from_json(message)
+
+
+def test_from_json_invalid_protected(json_backend, envelope: JweEnvelope):
+    message = envelope.serialize()
+    message["protected"] = jwe.b64url("{")
+    with pytest.raises(ValueError, match="invalid JSON for protected headers"):
+        JweEnvelope.from_json(json.dumps(message))